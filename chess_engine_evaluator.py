@@ -3,24 +3,232 @@ Chess Position Evaluator using Stockfish Engine
 Requires: python-chess and stockfish engine installed
 """
 
+import bisect
+import functools
+import os
+import queue
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+
 import chess
 import chess.engine
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Union
 from pathlib import Path
 
+from disk_cache import DiskCache, canonical_fen
+
+
+# Common paths where Stockfish might be installed
+_STOCKFISH_PATHS = (
+    '/usr/games/stockfish',
+    '/usr/local/bin/stockfish',
+    '/usr/bin/stockfish',
+    '/opt/homebrew/bin/stockfish',
+    './stockfish',
+)
+
+
+# Evaluation text by absolute advantage in pawns: below 0.5, 1.5, 3.0 and above
+_EVALUATION_THRESHOLDS = (0.5, 1.5, 3.0)
+_EVALUATION_TEMPLATES = (
+    "Equal position",
+    "Slight advantage for {side} ({pawns:+.2f})",
+    "Clear advantage for {side} ({pawns:+.2f})",
+    "Winning for {side} ({pawns:+.2f})",
+)
+
+
+# Absolute path of the first Stockfish found; failed lookups are retried
+_discovered_stockfish: Optional[str] = None
+
+
+def _discover_stockfish() -> Optional[str]:
+    """Locate Stockfish on PATH or in a common location (memoized once found)."""
+    global _discovered_stockfish
+    if _discovered_stockfish is None:
+        path = shutil.which('stockfish') or next((p for p in _STOCKFISH_PATHS if Path(p).exists()), None)
+        if path:
+            _discovered_stockfish = os.path.abspath(path)
+    return _discovered_stockfish
+
+
+@dataclass(slots=True)
+class Evaluation:
+    """Engine evaluation of a single position (scores from white's perspective)."""
+    
+    fen: str
+    depth: Optional[int] = None
+    score: Optional[int] = None
+    mate: Optional[int] = None
+    evaluation_text: Optional[str] = None
+    best_move: Optional[str] = None
+    pv: List[str] = field(default_factory=list)
+    pv_san: List[str] = field(default_factory=list)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the evaluation as a plain dictionary (e.g. for JSON or dict-based callers)."""
+        return asdict(self)
+
+
+def evaluations_to_arrays(evaluations: List[Evaluation]) -> Dict[str, Any]:
+    """
+    Pack scores, mates and depths of evaluations into NumPy arrays.
+    
+    Args:
+        evaluations: Evaluations, e.g. from evaluate_moves_sequence()
+    
+    Returns:
+        Dictionary with 'score', 'mate' and 'depth' float arrays (NaN where missing)
+    
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    import numpy as np
+    
+    def column(name):
+        values = (getattr(evaluation, name) for evaluation in evaluations)
+        return np.fromiter(
+            (np.nan if value is None else value for value in values),
+            dtype=np.float64,
+            count=len(evaluations)
+        )
+    
+    return {name: column(name) for name in ('score', 'mate', 'depth')}
+
+
+@functools.lru_cache(maxsize=16)
+def _limit(depth: Optional[int], time: Optional[float]) -> chess.engine.Limit:
+    """Shared analysis limit per (depth, time) pair (memoized; limits are never mutated)."""
+    return chess.engine.Limit(depth=depth, time=time)
+
+
+class EnginePool:
+    """Pool of single-threaded Stockfish processes for analysing positions in parallel."""
+    
+    def __init__(
+        self,
+        engine_path: str,
+        size: Optional[int] = None,
+        threads: int = 1,
+        hash_mb: int = 16
+    ):
+        """
+        Initialize the engine pool.
+        
+        Args:
+            engine_path: Path to the Stockfish executable
+            size: Number of engine processes (default: number of CPU cores)
+            threads: Search threads per engine process (default: 1)
+            hash_mb: Hash table size per engine process in MB (default: 16)
+        """
+        self.engine_path = engine_path
+        self.size = size or os.cpu_count() or 1
+        self.options = {'Threads': threads, 'Hash': hash_mb}
+        self._engines: List[chess.engine.SimpleEngine] = []
+        self._idle: queue.Queue = queue.Queue()
+    
+    def __enter__(self):
+        """Context manager entry - start the engines."""
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - close the engines."""
+        self.close()
+    
+    def start(self, count: Optional[int] = None) -> 'EnginePool':
+        """
+        Start engine processes until the pool has count of them.
+        
+        Args:
+            count: Number of engines wanted (default and maximum: pool size)
+        
+        Raises:
+            Any error from starting an engine, after closing every engine in the pool
+        """
+        wanted = self.size if count is None else min(count, self.size)
+        try:
+            while len(self._engines) < wanted:
+                engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
+                try:
+                    engine.configure(self.options)
+                except Exception:
+                    engine.quit()
+                    raise
+                self._engines.append(engine)
+                self._idle.put(engine)
+        except Exception:
+            self.close()
+            raise
+        return self
+    
+    def close(self):
+        """Quit all engine processes in the pool."""
+        for engine in self._engines:
+            engine.quit()
+        self._engines = []
+        self._idle = queue.Queue()
+    
+    def map(self, func: Callable[[chess.engine.SimpleEngine, Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Apply a function to each item in parallel, one idle engine per call.
+        
+        Engines are started on demand, never more than there are items.
+        
+        Args:
+            func: Callable taking (engine, item)
+            items: Items to process
+        
+        Returns:
+            List of results in the same order as items
+        """
+        def run(item):
+            engine = self._idle.get()
+            try:
+                return func(engine, item)
+            finally:
+                self._idle.put(engine)
+        
+        if not items:
+            return []
+        
+        self.start(len(items))
+        with ThreadPoolExecutor(max_workers=len(self._engines)) as executor:
+            return list(executor.map(run, items))
+
 
 class ChessEngineEvaluator:
     """Evaluate chess positions using Stockfish engine."""
     
-    def __init__(self, engine_path: Optional[str] = None, depth: int = 20):
+    def __init__(
+        self,
+        engine_path: Optional[str] = None,
+        depth: int = 20,
+        workers: Optional[int] = None,
+        cache_path: Optional[str] = None,
+        threads: int = 1,
+        hash_mb: int = 256
+    ):
         """
         Initialize the chess engine evaluator.
         
         Args:
             engine_path: Path to the Stockfish executable (None for auto-detection)
             depth: Default analysis depth (default: 20)
+            workers: Engine processes used for batch analysis (default: number of CPU cores)
+            cache_path: File path for an on-disk cache of depth-limited evaluations,
+                e.g. '.cache/engine' (None to disable)
+            threads: Search threads of the main engine (default: 1). More threads speed up
+                single positions but make scores nondeterministic, so such results are not cached;
+                batch methods get their parallelism from the single-threaded pool instead
+            hash_mb: Hash table size of the main engine in MB (default: 256)
         """
         self.depth = depth
+        self.workers = workers
+        self.cache_path = cache_path
+        self.cache = None
+        self.threads = threads
+        self.hash_mb = hash_mb
         
         # Try to find Stockfish if path not provided
         if engine_path is None:
@@ -28,6 +236,7 @@ class ChessEngineEvaluator:
         
         self.engine_path = engine_path
         self.engine = None
+        self.pool = None
     
     def _find_stockfish(self) -> str:
         """
@@ -39,19 +248,9 @@ class ChessEngineEvaluator:
         Raises:
             FileNotFoundError: If Stockfish cannot be found
         """
-        # Common paths where Stockfish might be installed
-        possible_paths = [
-            '/usr/games/stockfish',
-            '/usr/local/bin/stockfish',
-            '/usr/bin/stockfish',
-            '/opt/homebrew/bin/stockfish',
-            'stockfish',  # If in PATH
-            './stockfish',
-        ]
-        
-        for path in possible_paths:
-            if Path(path).exists() or path == 'stockfish':
-                return path
+        path = _discover_stockfish()
+        if path:
+            return path
         
         raise FileNotFoundError(
             "Stockfish not found. Please install it or provide the path explicitly.\n"
@@ -61,19 +260,28 @@ class ChessEngineEvaluator:
     def __enter__(self):
         """Context manager entry - start the engine."""
         self.engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
+        self.engine.configure({'Threads': self.threads, 'Hash': self.hash_mb})
+        if self.cache_path:
+            self.cache = DiskCache(self.cache_path)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - close the engine."""
         if self.engine:
             self.engine.quit()
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+        if self.cache:
+            self.cache.close()
+            self.cache = None
     
     def evaluate_position(
         self,
         fen: str,
         depth: Optional[int] = None,
         time_limit: Optional[float] = None
-    ) -> Dict[str, Any]:
+    ) -> Evaluation:
         """
         Evaluate a chess position.
         
@@ -83,33 +291,79 @@ class ChessEngineEvaluator:
             time_limit: Time limit in seconds (alternative to depth)
         
         Returns:
-            Dictionary containing:
+            Evaluation containing (as_dict() gives a plain dictionary):
                 - score: Centipawn score (from white's perspective)
                 - mate: Mate in N moves (if applicable)
                 - best_move: Best move in UCI notation
                 - pv: Principal variation (best line)
+                - pv_san: First moves of the principal variation in SAN
                 - evaluation_text: Human-readable evaluation
         """
-        if not self.engine:
-            raise RuntimeError("Engine not started. Use 'with' statement or call start_engine()")
+        self._require_engine()
         
-        board = chess.Board(fen)
+        return self._evaluate_board(self.engine, chess.Board(fen), depth=depth, time_limit=time_limit, fen=fen)
+    
+    def _evaluate_board(
+        self,
+        engine: chess.engine.SimpleEngine,
+        board: chess.Board,
+        depth: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        fen: Optional[str] = None,
+        game: object = None
+    ) -> Evaluation:
+        """
+        Evaluate a live board on the given engine (see evaluate_position).
+        
+        The board is left unchanged. fen may be passed when the caller already has it,
+        otherwise it is computed from the board. game is passed to the engine, which
+        clears its hash (ucinewgame) only when game differs from the previous analysis.
+        Depth-limited results are cached when a cache is configured; time-limited and
+        multi-threaded searches are not reproducible and bypass it.
+        """
+        fen = fen or board.fen()
         
         # Set analysis limit
-        if time_limit:
-            limit = chess.engine.Limit(time=time_limit)
-        else:
-            limit = chess.engine.Limit(depth=depth or self.depth)
+        limit = self._analysis_limit(depth, time_limit)
         
-        # Analyze the position
-        info = self.engine.analyse(board, limit)
+        cache_key = self._cache_key(engine, fen, limit)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                cached['fen'] = fen
+                return Evaluation(**cached)
         
+        # Analyze the position
+        info = engine.analyse(board, limit, game=game)
+        result = self._build_result(board, info, fen=fen)
+        if cache_key:
+            self.cache.set(cache_key, result.as_dict())
+        return result
+    
+    def _cache_key(
+        self,
+        engine: chess.engine.SimpleEngine,
+        fen: str,
+        limit: chess.engine.Limit
+    ) -> Optional[str]:
+        """Evaluation cache key for a search, or None if it is not cacheable."""
+        # Pool engines always search with one thread
+        deterministic = engine is not self.engine or self.threads == 1
+        if not self.cache or limit.time is not None or not deterministic:
+            return None
+        return DiskCache.make_key(self.engine_path, canonical_fen(fen), limit.depth)
+    
+    def _build_result(
+        self,
+        board: chess.Board,
+        info: chess.engine.InfoDict,
+        fen: Optional[str] = None,
+        score_only: bool = False
+    ) -> Evaluation:
+        """Build the evaluation for a board from engine analysis info."""
         # Extract score
         score = info.get('score')
-        result = {
-            'fen': fen,
-            'depth': info.get('depth'),
-        }
+        result = Evaluation(fen=fen or board.fen(), depth=info.get('depth'))
         
         if score:
             # Convert score to white's perspective
@@ -120,30 +374,33 @@ class ChessEngineEvaluator:
             
             if score.is_mate():
                 mate_in = score.mate()
-                result['mate'] = mate_in
-                result['score'] = None
-                result['evaluation_text'] = f"Mate in {abs(mate_in)}" + (" for white" if mate_in > 0 else " for black")
+                result.mate = mate_in
+                result.evaluation_text = f"Mate in {abs(mate_in)}" + (" for white" if mate_in > 0 else " for black")
             else:
                 cp_score = score.score()
-                result['score'] = cp_score
-                result['mate'] = None
-                result['evaluation_text'] = self._format_evaluation(cp_score)
+                result.score = cp_score
+                result.evaluation_text = self._format_evaluation(cp_score)
         
         # Best move and principal variation
         if 'pv' in info and info['pv']:
-            result['best_move'] = info['pv'][0].uci()
-            result['pv'] = [move.uci() for move in info['pv']]
+            result.best_move = info['pv'][0].uci()
+            result.pv = [move.uci() for move in info['pv']]
+            if score_only:
+                return result
             
-            # Convert PV to SAN notation using a copy of the board
-            pv_san = []
-            board_copy = board.copy()
-            for move in info['pv'][:10]:  # First 10 moves in SAN
-                try:
-                    pv_san.append(board_copy.san(move))
-                    board_copy.push(move)
-                except (ValueError, AssertionError):
-                    break
-            result['pv_san'] = pv_san
+            # Convert PV to SAN notation by walking the board and restoring it afterwards
+            # (san_and_push reuses the pushed position for the check suffix)
+            pushed = 0
+            try:
+                for move in info['pv'][:10]:  # First 10 moves in SAN
+                    try:
+                        result.pv_san.append(board.san_and_push(move))
+                    except (ValueError, AssertionError):
+                        break
+                    pushed += 1
+            finally:
+                for _ in range(pushed):
+                    board.pop()
         
         return result
     
@@ -151,8 +408,9 @@ class ChessEngineEvaluator:
         self,
         moves: List[str],
         starting_fen: Optional[str] = None,
-        depth: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+        depth: Optional[int] = None,
+        keep_hash: bool = False
+    ) -> List[Evaluation]:
         """
         Evaluate each position in a sequence of moves.
         
@@ -160,27 +418,38 @@ class ChessEngineEvaluator:
             moves: List of moves in UCI notation
             starting_fen: Starting position (None for standard starting position)
             depth: Analysis depth (uses default if None)
+            keep_hash: Analyse the positions in order on one engine, keeping its hash table
+                between them (cleared only when starting_fen changes) instead of using the pool
         
         Returns:
-            List of evaluation dictionaries for each position
+            List of evaluations for each position
         """
         board = chess.Board(starting_fen) if starting_fen else chess.Board()
+        parallel = self._use_pool(len(moves) + 1) and not keep_hash
+        game = (starting_fen or chess.STARTING_FEN) if keep_hash else None
         evaluations = []
+        snapshots = []
         
-        # Evaluate starting position
-        evaluations.append(self.evaluate_position(board.fen(), depth=depth))
+        # Evaluate the starting position and the position after each move,
+        # snapshotting the board instead when the positions go to the pool
+        for move_uci in [None] + moves:
+            if move_uci is not None:
+                try:
+                    move = chess.Move.from_uci(move_uci)
+                    if not board.is_legal(move):
+                        raise ValueError(f"Illegal move: {move_uci}")
+                    board.push(move)
+                except ValueError as e:
+                    print(f"Error processing move {move_uci}: {e}")
+                    break
+            
+            if parallel:
+                snapshots.append(board.copy(stack=False))
+            else:
+                evaluations.append(self._evaluate_board(self.engine, board, depth=depth, game=game))
         
-        # Evaluate after each move
-        for move_uci in moves:
-            try:
-                move = chess.Move.from_uci(move_uci)
-                if move not in board.legal_moves:
-                    raise ValueError(f"Illegal move: {move_uci}")
-                board.push(move)
-                evaluations.append(self.evaluate_position(board.fen(), depth=depth))
-            except ValueError as e:
-                print(f"Error processing move {move_uci}: {e}")
-                break
+        if parallel:
+            evaluations = self._evaluate_many(snapshots, depth=depth)
         
         return evaluations
     
@@ -201,15 +470,32 @@ class ChessEngineEvaluator:
         Returns:
             Best move in UCI notation
         """
-        evaluation = self.evaluate_position(fen, depth=depth, time_limit=time_limit)
-        return evaluation.get('best_move')
+        self._require_engine()
+        
+        limit = self._analysis_limit(depth, time_limit)
+        
+        # Reuse a cached evaluation of the position when there is one
+        cache_key = self._cache_key(self.engine, fen, limit)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None and cached.get('best_move'):
+                return cached['best_move']
+        
+        return self._fast_best_move(chess.Board(fen), limit)
+    
+    def _fast_best_move(self, board: chess.Board, limit: chess.engine.Limit) -> Optional[str]:
+        """Search for the best move only, without building an evaluation."""
+        info = self.engine.analyse(board, limit, info=chess.engine.INFO_PV)
+        pv = info.get('pv')
+        return pv[0].uci() if pv else None
     
     def compare_moves(
         self,
         fen: str,
         moves: List[str],
-        depth: Optional[int] = None
-    ) -> Dict[str, Dict[str, Any]]:
+        depth: Optional[int] = None,
+        score_only: bool = False
+    ) -> Dict[str, Union[Evaluation, Dict[str, str]]]:
         """
         Compare multiple candidate moves from the same position.
         
@@ -217,39 +503,118 @@ class ChessEngineEvaluator:
             fen: FEN string of the position
             moves: List of moves in UCI notation to compare
             depth: Analysis depth (uses default if None)
+            score_only: Skip the SAN principal variation (pv_san) in each evaluation
         
         Returns:
-            Dictionary mapping each move to its evaluation
+            Dictionary mapping each move to its evaluation ({'error': ...} for invalid moves)
         """
+        self._require_engine()
+        
         board = chess.Board(fen)
         results = {}
+        candidates = {}
         
         for move_uci in moves:
             try:
                 move = chess.Move.from_uci(move_uci)
-                if move not in board.legal_moves:
+                if not board.is_legal(move):
                     results[move_uci] = {'error': 'Illegal move'}
                     continue
-                
-                # Make the move and evaluate
-                board.push(move)
-                evaluation = self.evaluate_position(board.fen(), depth=depth)
-                
-                # Flip score since we're evaluating from opponent's perspective
-                if evaluation.get('score') is not None:
-                    evaluation['score'] = -evaluation['score']
-                if evaluation.get('mate') is not None:
-                    evaluation['mate'] = -evaluation['mate']
-                
-                results[move_uci] = evaluation
-                board.pop()
-                
+                candidates[move_uci] = move
+                results[move_uci] = None
             except ValueError as e:
                 results[move_uci] = {'error': str(e)}
         
+        if not candidates:
+            return results
+        
+        # One MultiPV search from the root covers every candidate it ranks; the
+        # rest get a second root search at the same depth restricted to them,
+        # so all candidates are scored on the same search depth
+        lines = self._root_lines(board, depth, max(len(candidates), 10))
+        missing = [move for move in candidates.values() if move not in lines]
+        if missing:
+            lines.update(self._root_lines(board, depth, len(missing), root_moves=missing))
+        
+        for move_uci, move in candidates.items():
+            # Continue the root line from the position after the move
+            line = lines.get(move, {})
+            child_info = {'depth': line.get('depth'), 'score': line.get('score'), 'pv': line.get('pv', [])[1:]}
+            board.push(move)
+            results[move_uci] = self._flip_evaluation(
+                self._build_result(board, child_info, score_only=score_only)
+            )
+            board.pop()
+        
         return results
     
+    def _root_lines(
+        self,
+        board: chess.Board,
+        depth: Optional[int],
+        multipv: int,
+        root_moves: Optional[List[chess.Move]] = None
+    ) -> Dict[chess.Move, chess.engine.InfoDict]:
+        """Run a MultiPV search from board and index its lines by first move."""
+        infos = self.engine.analyse(
+            board,
+            self._analysis_limit(depth),
+            multipv=multipv,
+            root_moves=root_moves,
+            info=chess.engine.INFO_SCORE | chess.engine.INFO_PV
+        )
+        return {info['pv'][0]: info for info in infos if info.get('pv')}
+    
+    def _analysis_limit(self, depth: Optional[int] = None, time_limit: Optional[float] = None) -> chess.engine.Limit:
+        """Analysis limit for a time limit, or else for depth (uses default if None)."""
+        if time_limit:
+            return _limit(None, time_limit)
+        return _limit(depth or self.depth, None)
+    
+    @staticmethod
+    def _flip_evaluation(evaluation: Evaluation) -> Evaluation:
+        """Flip score and mate of an evaluation made from the opponent's perspective."""
+        if evaluation.score is not None:
+            evaluation.score = -evaluation.score
+        if evaluation.mate is not None:
+            evaluation.mate = -evaluation.mate
+        return evaluation
+    
+    def _require_engine(self):
+        """Raise RuntimeError unless the engine has been started."""
+        if not self.engine:
+            raise RuntimeError("Engine not started. Use the evaluator in a 'with' statement")
+    
+    def _use_pool(self, count: int) -> bool:
+        """Whether a batch of count positions should be dispatched to the engine pool."""
+        self._require_engine()
+        return count > 1 and self.workers != 1
+    
+    def _evaluate_many(
+        self,
+        boards: List[chess.Board],
+        depth: Optional[int] = None
+    ) -> List[Evaluation]:
+        """
+        Evaluate independent positions in parallel across the engine pool.
+        
+        Args:
+            boards: Boards of the positions to evaluate (one per worker call, not shared)
+            depth: Analysis depth (uses default if None)
+        
+        Returns:
+            List of evaluations in the same order as boards
+        """
+        if not boards:
+            return []
+        
+        if self.pool is None:
+            self.pool = EnginePool(self.engine_path, size=self.workers)
+        
+        return self.pool.map(lambda engine, board: self._evaluate_board(engine, board, depth=depth), boards)
+    
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _format_evaluation(centipawns: int) -> str:
         """
         Format centipawn score as human-readable text.
@@ -261,18 +626,9 @@ class ChessEngineEvaluator:
             Formatted evaluation string
         """
         pawns = centipawns / 100
-        
-        if abs(pawns) < 0.5:
-            return "Equal position"
-        elif abs(pawns) < 1.5:
-            side = "white" if pawns > 0 else "black"
-            return f"Slight advantage for {side} ({pawns:+.2f})"
-        elif abs(pawns) < 3.0:
-            side = "white" if pawns > 0 else "black"
-            return f"Clear advantage for {side} ({pawns:+.2f})"
-        else:
-            side = "white" if pawns > 0 else "black"
-            return f"Winning for {side} ({pawns:+.2f})"
+        side = "white" if pawns > 0 else "black"
+        template = _EVALUATION_TEMPLATES[bisect.bisect_right(_EVALUATION_THRESHOLDS, abs(pawns))]
+        return template.format(side=side, pawns=pawns)
 
 
 def main():
@@ -284,10 +640,10 @@ def main():
         # Example 1: Evaluate starting position
         print("=== Starting Position ===")
         result = evaluator.evaluate_position(chess.STARTING_FEN)
-        print(f"Evaluation: {result['evaluation_text']}")
-        print(f"Score: {result.get('score', 'N/A')} centipawns")
-        print(f"Best move: {result.get('best_move')}")
-        print(f"Principal variation: {' '.join(result.get('pv_san', [])[:5])}")
+        print(f"Evaluation: {result.evaluation_text}")
+        print(f"Score: {result.score if result.score is not None else 'N/A'} centipawns")
+        print(f"Best move: {result.best_move}")
+        print(f"Principal variation: {' '.join(result.pv_san[:5])}")
         
         # Example 2: Evaluate after 1.e4 e5 2.Nf3
         print("\n=== After 1.e4 e5 2.Nf3 ===")
@@ -296,17 +652,17 @@ def main():
             board.push(chess.Move.from_uci(move))
         
         result = evaluator.evaluate_position(board.fen())
-        print(f"Evaluation: {result['evaluation_text']}")
-        print(f"Score: {result.get('score', 'N/A')} centipawns")
-        print(f"Best move: {result.get('best_move')}")
+        print(f"Evaluation: {result.evaluation_text}")
+        print(f"Score: {result.score if result.score is not None else 'N/A'} centipawns")
+        print(f"Best move: {result.best_move}")
         
         # Example 3: Evaluate a tactical position (Scholar's Mate setup)
         print("\n=== Tactical Position (Scholar's Mate Threat) ===")
         fen = "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"
         result = evaluator.evaluate_position(fen)
-        print(f"Evaluation: {result['evaluation_text']}")
-        print(f"Best move: {result.get('best_move')}")
-        print(f"Principal variation: {' '.join(result.get('pv_san', [])[:5])}")
+        print(f"Evaluation: {result.evaluation_text}")
+        print(f"Best move: {result.best_move}")
+        print(f"Principal variation: {' '.join(result.pv_san[:5])}")
         
         # Example 4: Compare multiple candidate moves
         print("\n=== Comparing Candidate Moves ===")
@@ -314,14 +670,13 @@ def main():
         candidate_moves = ['e2e4', 'd2d4', 'g1f3', 'c2c4']
         comparisons = evaluator.compare_moves(starting_fen, candidate_moves, depth=12)
         
-        for move, eval_result in sorted(
-            comparisons.items(),
-            key=lambda x: x[1].get('score', -9999),
-            reverse=True
-        ):
-            score = eval_result.get('score')
-            if score is not None:
-                print(f"{move}: {score/100:+.2f} pawns - {eval_result.get('evaluation_text')}")
+        def comparison_score(item):
+            score = getattr(item[1], 'score', None)  # None for mates and {'error': ...} entries
+            return score if score is not None else -9999
+        
+        for move, eval_result in sorted(comparisons.items(), key=comparison_score, reverse=True):
+            if isinstance(eval_result, Evaluation) and eval_result.score is not None:
+                print(f"{move}: {eval_result.score/100:+.2f} pawns - {eval_result.evaluation_text}")
             else:
                 print(f"{move}: {eval_result}")
         
@@ -331,13 +686,13 @@ def main():
         evaluations = evaluator.evaluate_moves_sequence(moves, depth=12)
         
         board = chess.Board()
-        print(f"0. Starting position: {evaluations[0].get('score', 0)/100:+.2f}")
+        print(f"0. Starting position: {(evaluations[0].score or 0)/100:+.2f}")
         
         for i, move_uci in enumerate(moves):
             move = chess.Move.from_uci(move_uci)
             san_move = board.san(move)
             board.push(move)
-            eval_score = evaluations[i+1].get('score', 0) / 100
+            eval_score = (evaluations[i+1].score or 0) / 100
             print(f"{i+1}. {san_move}: {eval_score:+.2f}")
 
 
@@ -0,0 +1,125 @@
+"""
+On-disk cache for Lichess explorer responses and engine evaluations
+Backed by the standard library shelve module
+"""
+
+import hashlib
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Any
+
+
+def canonical_fen(fen: str) -> str:
+    """
+    Strip the halfmove clock and fullmove number from a FEN.
+    
+    Args:
+        fen: FEN string
+    
+    Returns:
+        FEN with only the placement, side to move, castling and en passant fields
+    """
+    return ' '.join(fen.split()[:4])
+
+
+class DiskCache:
+    """Thread-safe shelve-backed key/value cache with expiry and a least-recently-used entry limit."""
+    
+    def __init__(
+        self,
+        path: str,
+        expire: Optional[float] = None,
+        max_entries: int = 100_000,
+        sync_interval: float = 30.0
+    ):
+        """
+        Open (or create) the cache.
+        
+        Args:
+            path: File path of the cache (e.g. '.cache/explorer')
+            expire: Seconds after which entries are dropped (None to keep forever)
+            max_entries: Maximum number of entries; the least recently used are evicted beyond it
+            sync_interval: Minimum seconds between flushes to disk (the cache is also flushed on close)
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.expire = expire
+        self.max_entries = max_entries
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._shelf = shelve.open(path)
+        self._last_sync = time.monotonic()
+        
+        # Keys from least to most recently used; entries already on disk start in storage order
+        self._order: OrderedDict = OrderedDict.fromkeys(self._shelf.keys())
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from the parameters that determine a result.
+        
+        Args:
+            *parts: Hashable parameters (FEN, depth, filters, ...)
+        
+        Returns:
+            Hex digest of the parameters
+        """
+        return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value.
+        
+        Args:
+            key: Key from make_key()
+        
+        Returns:
+            The cached value, or None if missing or expired (expired entries are deleted)
+        """
+        with self._lock:
+            entry = self._shelf.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, value = entry
+            if self.expire is not None and time.time() - stored_at > self.expire:
+                self._delete(key)
+                return None
+            
+            self._order.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any):
+        """
+        Store a value.
+        
+        Args:
+            key: Key from make_key()
+            value: Picklable value to store
+        """
+        with self._lock:
+            self._shelf[key] = (time.time(), value)
+            self._order[key] = None
+            self._order.move_to_end(key)
+            
+            while len(self._order) > self.max_entries:
+                self._delete(next(iter(self._order)))
+            
+            if time.monotonic() - self._last_sync > self.sync_interval:
+                self._shelf.sync()
+                self._last_sync = time.monotonic()
+    
+    def _delete(self, key: str):
+        """Remove an entry (caller holds the lock)."""
+        self._order.pop(key, None)
+        try:
+            del self._shelf[key]
+        except KeyError:
+            pass
+    
+    def close(self):
+        """Flush and close the underlying shelf."""
+        with self._lock:
+            self._shelf.close()
@@ -3,22 +3,80 @@ Query the Lichess Opening Explorer API
 API Documentation: https://lichess.org/api#tag/opening-explorer/get/lichess
 """
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, Any, List
 from urllib.parse import urlencode
 
+from disk_cache import DiskCache, canonical_fen
+
+try:
+    import orjson  # faster JSON decoding when installed
+except ImportError:
+    orjson = None
+
+
+# Optional query filters: (argument name, API parameter, converter), sent only when set
+_FILTER_PARAMS = (
+    ('speeds', 'speeds', ','.join),
+    ('ratings', 'ratings', lambda ratings: ','.join(map(str, ratings))),
+    ('since', 'since', str),
+    ('until', 'until', str),
+    ('history', 'history', lambda history: 'true'),
+)
+
 
 class LichessOpeningExplorer:
     """Client for querying the Lichess Opening Explorer API."""
     
     BASE_URL = "https://explorer.lichess.ovh/lichess"
     
-    def __init__(self):
-        """Initialize the Lichess Opening Explorer client."""
+    def __init__(self, cache_path: Optional[str] = None, cache_expire: float = 86400):
+        """
+        Initialize the Lichess Opening Explorer client.
+        
+        Args:
+            cache_path: File path for an on-disk response cache, e.g. '.cache/explorer' (None to disable)
+            cache_expire: Seconds before cached responses are refetched (default: 1 day)
+        """
+        self.cache = DiskCache(cache_path, expire=cache_expire) if cache_path else None
         self.session = requests.Session()
         self.session.headers.update({
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip'
         })
+        
+        # Keep connections alive and retry transient failures, waiting out
+        # rate limits (429) for as long as the Retry-After header asks
+        retry = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        self.session.mount('https://', adapter)
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit - close the session and cache."""
+        self.close()
+    
+    def close(self):
+        """Close the HTTP session and flush and close the response cache, if any."""
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+            self.cache = None
     
     def query(
         self,
@@ -53,6 +111,50 @@ class LichessOpeningExplorer:
         Returns:
             Dictionary containing the API response with opening statistics
         """
+        speeds = tuple(speeds or ())
+        ratings = tuple(ratings or ())
+        
+        if self.cache:
+            cache_key = DiskCache.make_key(
+                self.BASE_URL, canonical_fen(fen) if fen else None, play, variant,
+                speeds, ratings, since, until,
+                moves, top_games, recent_games, history
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Only the position changes between most calls; the filters are encoded once
+        query_string = self._filter_query_string(
+            variant, moves, top_games, recent_games,
+            speeds=speeds, ratings=ratings, since=since, until=until, history=history
+        )
+        position = {}
+        if fen:
+            position['fen'] = fen
+        if play:
+            position['play'] = play
+        if position:
+            query_string += '&' + urlencode(position)
+        
+        response = self.session.get(f"{self.BASE_URL}?{query_string}")
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content) if orjson else response.json()
+        if self.cache:
+            self.cache.set(cache_key, data)
+        return data
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _filter_query_string(
+        variant: str,
+        moves: int,
+        top_games: int,
+        recent_games: int,
+        **filters: Any
+    ) -> str:
+        """Encode the position-independent query parameters (memoized, filters must be hashable)."""
         params = {
             'variant': variant,
             'moves': moves,
@@ -60,25 +162,26 @@ class LichessOpeningExplorer:
             'recentGames': recent_games
         }
         
-        if fen:
-            params['fen'] = fen
-        if play:
-            params['play'] = play
-        if speeds:
-            params['speeds'] = ','.join(speeds)
-        if ratings:
-            params['ratings'] = ','.join(map(str, ratings))
-        if since:
-            params['since'] = since
-        if until:
-            params['until'] = until
-        if history:
-            params['history'] = 'true'
-        
-        response = self.session.get(self.BASE_URL, params=params)
-        response.raise_for_status()
+        for name, param, convert in _FILTER_PARAMS:
+            value = filters.get(name)
+            if value:
+                params[param] = convert(value)
         
-        return response.json()
+        return urlencode(params)
+    
+    def query_many(self, param_list: List[Dict[str, Any]], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        Run several queries concurrently over the pooled session.
+        
+        Args:
+            param_list: List of keyword-argument dictionaries, one per query() call
+            max_workers: Maximum number of requests in flight (default: 8)
+        
+        Returns:
+            List of API responses in the same order as param_list
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda params: self.query(**params), param_list))
     
     def get_position_stats(self, fen: str, **kwargs) -> Dict[str, Any]:
         """
@@ -107,6 +210,53 @@ class LichessOpeningExplorer:
         return self.query(play=moves, **kwargs)
 
 
+def total_games(stats: Dict[str, Any]) -> int:
+    """
+    Total number of games in a position or move record.
+    
+    Args:
+        stats: API response or one entry of its 'moves' list
+    
+    Returns:
+        Sum of white wins, draws and black wins
+    """
+    return stats.get('white', 0) + stats.get('draws', 0) + stats.get('black', 0)
+
+
+def summarize_moves(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Aggregate the move records of an explorer response in one pass.
+    
+    Args:
+        result: API response from LichessOpeningExplorer.query()
+    
+    Returns:
+        List of dictionaries (in API order, most popular first) containing:
+            - uci, san: The move
+            - games: Total games with the move
+            - white_score: White's score in percent (wins plus half the draws), None without games
+    """
+    summary = []
+    for move in result.get('moves', []):
+        white = move.get('white', 0)
+        draws = move.get('draws', 0)
+        games = white + draws + move.get('black', 0)
+        summary.append({
+            'uci': move['uci'],
+            'san': move['san'],
+            'games': games,
+            'white_score': (white + 0.5 * draws) / games * 100 if games else None
+        })
+    return summary
+
+
+def _format_white_score(move: Dict[str, Any]) -> str:
+    """Format a summarize_moves() entry's white score for display (empty without games)."""
+    if move['white_score'] is None:
+        return ""
+    return f", white scores {move['white_score']:.1f}%"
+
+
 def main():
     """Example usage of the Lichess Opening Explorer API."""
     explorer = LichessOpeningExplorer()
@@ -114,29 +264,29 @@ def main():
     # Example 1: Query the starting position
     print("=== Starting Position ===")
     result = explorer.query()
-    print(f"Total games: {result.get('white', 0) + result.get('draws', 0) + result.get('black', 0)}")
+    print(f"Total games: {total_games(result)}")
     print(f"White wins: {result.get('white', 0)}")
     print(f"Draws: {result.get('draws', 0)}")
     print(f"Black wins: {result.get('black', 0)}")
     print("\nMost popular moves:")
-    for move in result.get('moves', [])[:5]:
-        print(f"  {move['uci']} ({move['san']}): {move.get('white', 0) + move.get('draws', 0) + move.get('black', 0)} games")
+    for move in summarize_moves(result)[:5]:
+        print(f"  {move['uci']} ({move['san']}): {move['games']} games{_format_white_score(move)}")
     
     # Example 2: Query after 1.e4
     print("\n=== After 1.e4 ===")
     result = explorer.get_moves_sequence_stats("e2e4")
-    print(f"Total games: {result.get('white', 0) + result.get('draws', 0) + result.get('black', 0)}")
+    print(f"Total games: {total_games(result)}")
     print("\nMost popular replies:")
-    for move in result.get('moves', [])[:5]:
-        print(f"  {move['uci']} ({move['san']}): {move.get('white', 0) + move.get('draws', 0) + move.get('black', 0)} games")
+    for move in summarize_moves(result)[:5]:
+        print(f"  {move['uci']} ({move['san']}): {move['games']} games{_format_white_score(move)}")
     
     # Example 3: Query with filters (blitz games, ratings 2000+)
     print("\n=== Starting Position (Blitz, 2000+ rating) ===")
     result = explorer.query(speeds=['blitz'], ratings=[2000, 2200, 2500])
-    print(f"Total games: {result.get('white', 0) + result.get('draws', 0) + result.get('black', 0)}")
+    print(f"Total games: {total_games(result)}")
     print("\nMost popular moves:")
-    for move in result.get('moves', [])[:5]:
-        print(f"  {move['uci']} ({move['san']}): {move.get('white', 0) + move.get('draws', 0) + move.get('black', 0)} games")
+    for move in summarize_moves(result)[:5]:
+        print(f"  {move['uci']} ({move['san']}): {move['games']} games{_format_white_score(move)}")
 
 
 if __name__ == "__main__":